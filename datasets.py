@@ -0,0 +1,235 @@
+import argparse
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import streamlit as st
+
+# Dataset registry
+# Every dashboard table is stored as a versioned, uncompressed Feather (Arrow IPC)
+# snapshot under DATA_DIR/<table>/vNNNN.feather. Snapshots are memory-mapped and
+# cached once per version for all sessions, and publishing a new version is picked
+# up on the next rerun without a redeploy.
+#
+# Published snapshots are the data of record and are not committed, so in production
+# HAZE_DATA_DIR must point at persistent storage (a mounted volume, not the app's
+# checkout). The dashboard never seeds tables itself: a data directory without
+# snapshots is reported as an error rather than quietly replaced by SEED_DATA.
+DATA_DIR = Path(os.environ.get("HAZE_DATA_DIR", Path(__file__).parent / "data"))
+SNAPSHOT_PATTERN = re.compile(r"^v(\d{4})\.feather$")
+
+SCHEMAS = {
+    'api_standards': pa.schema([
+        ('API Range', pa.string()),
+        ('Status', pa.string()),
+        ('Health Impact', pa.string()),
+    ]),
+    'health_facts': pa.schema([
+        ('Health Metric', pa.string()),
+        ('Finding', pa.string()),
+        ('Source', pa.string()),
+    ]),
+    'forest_loss': pa.schema([
+        ('State', pa.string()),
+        ('Forest Loss 2001-2023 (Million Hectares)', pa.float64()),
+    ]),
+    'timeline': pa.schema([
+        pa.field('Start Year', pa.int64(), nullable=False),
+        ('End Year', pa.int64()),
+        ('Initiative', pa.string()),
+        ('Type', pa.string()),
+        ('Status', pa.string()),
+    ]),
+    'gov_funding': pa.schema([
+        ('Category', pa.string()),
+        ('Program', pa.string()),
+        ('2024 (RM Million)', pa.int64()),
+        ('2025 (RM Million)', pa.int64()),
+    ]),
+    'plastic_bag_reactions': pa.schema([
+        ('Response Type', pa.string()),
+        ('Percentage', pa.int64()),
+        ('Description', pa.string()),
+    ]),
+    'campaign_participation': pa.schema([
+        ('Willingness Level', pa.string()),
+        ('Percentage', pa.int64()),
+    ]),
+}
+
+# Initial contents for a new data directory, published as v0001 of every table that
+# has no snapshot yet by `python datasets.py --bootstrap`. After that the snapshots
+# are authoritative and updates are published from CSV; editing these has no effect.
+SEED_DATA = {
+    # Malaysian Department of Environment API standards
+    'api_standards': {
+        'API Range': ['0-50', '51-100', '101-200', '201-300', '301+'],
+        'Status': ['Good', 'Moderate', 'Unhealthy', 'Very Unhealthy', 'Hazardous'],
+        'Health Impact': ['Minimal', 'Acceptable', 'Sensitive groups affected', 'Everyone affected', 'Emergency conditions']
+    },
+    'health_facts': {
+        'Health Metric': ['Particle Size', 'Lung Penetration', 'Vulnerable Groups'],
+        'Finding': ['94% of particles < 2.5μm diameter', 'Bypass normal body defense', 'Children and elderly most affected'],
+        'Source': ['Ramadhan et al., 2017', 'ScienceDirect Study', 'Multiple Studies']
+    },
+    # From Greenpeace Malaysia (2025), based on Global Forest Watch data
+    'forest_loss': {
+        'State': ['Sarawak', 'Sabah', 'Pahang'],
+        'Forest Loss 2001-2023 (Million Hectares)': [3.27, 1.88, 1.27]
+    },
+    # Start years from the original initiative timeline; end years stay null (ongoing)
+    # until a documented source for them is recorded here
+    'timeline': {
+        'Start Year': [2002, 2014, 2018, 2022, 2024, 2025],
+        'End Year': [None, None, None, None, None, None],
+        'Initiative': [
+            'ASEAN Agreement on Transboundary Haze',
+            'Singapore Transboundary Haze Pollution Act',
+            'Malaysia Bersih Campaign Launch',
+            'Carbon Pricing Introduction',
+            'Budget 2024 Environmental Allocation',
+            'National Energy Transition Fund Increase'
+        ],
+        'Type': ['Regional', 'National', 'National', 'National', 'National', 'National'],
+        'Status': ['Partially Implemented', 'Active', 'Ongoing', 'Planned', 'Implemented', 'Active']
+    },
+    'gov_funding': {
+        'Category': ['Energy Transition', 'Green Technology', 'Biodiversity Conservation', 'Climate Action', 'Environmental Ministry Operations'],
+        'Program': ['National Energy Transition Fund', 'Green Technology Financing', 'Biodiversity Conservation', 'Climate Action SDG', 'Environmental Ministry'],
+        '2024 (RM Million)': [100, 800, 800, 15, 7130],
+        '2025 (RM Million)': [300, 1000, 1000, 20, 7220]
+    },
+    # Johor State study on the No Plastic Bag Campaign
+    'plastic_bag_reactions': {
+        'Response Type': ['Fully Anti-Consumption', 'Partial Anti-Consumption', 'No Change/Resistance'],
+        'Percentage': [67, 33, 0],
+        'Description': [
+            'Complete behavior change, using reusable bags',
+            'Some behavior change, occasional plastic use',
+            'Continued plastic bag usage despite charges'
+        ]
+    },
+    'campaign_participation': {
+        'Willingness Level': ['Highly Willing', 'Moderately Willing', 'Somewhat Willing', 'Unwilling'],
+        'Percentage': [30, 25, 15, 30]
+    },
+}
+
+
+def snapshot_path(name, version):
+    return DATA_DIR / name / f"v{version:04d}.feather"
+
+
+def latest_version(name):
+    # Highest published version of a table, or None if nothing is on disk yet
+    table_dir = DATA_DIR / name
+    if not table_dir.is_dir():
+        return None
+    versions = [int(match.group(1)) for match in map(SNAPSHOT_PATTERN.match, os.listdir(table_dir)) if match]
+    return max(versions, default=None)
+
+
+def validate_table(name, table):
+    if name not in SCHEMAS:
+        raise KeyError(f"Unknown dataset '{name}'. Registered datasets: {', '.join(sorted(SCHEMAS))}")
+    schema = SCHEMAS[name]
+    if table.schema.names != schema.names:
+        raise ValueError(f"Dataset '{name}' expects columns {schema.names}, got {table.schema.names}")
+    # Safe cast only: rejects lossy conversions such as 1.5 -> int64, and nulls in
+    # non-nullable fields
+    table = table.cast(schema)
+    if name == 'timeline':
+        # A row ending before it starts would never match a year-range query
+        inverted = pc.sum(pc.less(table['End Year'], table['Start Year'])).as_py() or 0
+        if inverted:
+            raise ValueError(f"Dataset 'timeline' has {inverted} row(s) with End Year before Start Year")
+    return table
+
+
+def publish_snapshot(name, data, seed=False):
+    # Validate and write the next version; readers never see a partial file. With
+    # seed=True nothing is published if any version already exists, and that
+    # version is returned instead.
+    if isinstance(data, pd.DataFrame):
+        table = pa.Table.from_pandas(data, preserve_index=False)
+    elif isinstance(data, dict):
+        table = pa.Table.from_pydict(data)
+    else:
+        table = data
+    table = validate_table(name, table)
+
+    table_dir = DATA_DIR / name
+    table_dir.mkdir(parents=True, exist_ok=True)
+    # Uncompressed so the snapshot can be memory-mapped without decoding
+    fd, tmp_path = tempfile.mkstemp(dir=table_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        while True:
+            latest = latest_version(name)
+            if seed and latest is not None:
+                return latest
+            version = (latest or 0) + 1
+            # os.link never overwrites, so a published version is immutable and two
+            # concurrent publishers cannot claim the same number; the loser retries
+            try:
+                os.link(tmp_path, snapshot_path(name, version))
+            except FileExistsError:
+                continue
+            return version
+    finally:
+        os.unlink(tmp_path)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _load_snapshot(name, version):
+    table = feather.read_table(snapshot_path(name, version), memory_map=True)
+    table = validate_table(name, table)
+    # split_blocks lets numeric columns stay views over the mapped buffers
+    return table.to_pandas(split_blocks=True)
+
+
+def missing_tables():
+    # Registered tables with no snapshot in DATA_DIR
+    return [name for name in SCHEMAS if latest_version(name) is None]
+
+
+def current_version(name):
+    version = latest_version(name)
+    if version is None:
+        raise FileNotFoundError(
+            f"No snapshot of dataset '{name}' in {DATA_DIR}. Set HAZE_DATA_DIR to the "
+            f"published data, or run `python datasets.py --bootstrap` for a new one.")
+    return version
+
+
+def load_table(name, version=None):
+    # The returned DataFrame is shared by every session: treat it as read-only
+    if version is None:
+        version = current_version(name)
+    return _load_snapshot(name, version)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish a new dataset snapshot for the dashboard")
+    parser.add_argument("name", nargs="?", choices=sorted(SCHEMAS))
+    parser.add_argument("csv", nargs="?", help="CSV file with the full contents of the table")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="publish SEED_DATA for every table that has no snapshot yet")
+    args = parser.parse_args()
+    if args.bootstrap:
+        if args.name or args.csv:
+            parser.error("--bootstrap does not take a table or CSV")
+        for name in missing_tables():
+            published = publish_snapshot(name, SEED_DATA[name], seed=True)
+            print(f"Published {snapshot_path(name, published)}")
+    elif args.name and args.csv:
+        published = publish_snapshot(args.name, pd.read_csv(args.csv))
+        print(f"Published {snapshot_path(args.name, published)}")
+    else:
+        parser.error("expected a table name and CSV file, or --bootstrap")
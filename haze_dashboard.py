@@ -5,6 +5,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from datasets import DATA_DIR, current_version, load_table, missing_tables
+
 # Page configuration
 st.set_page_config(
     page_title="Malaysia Haze & Environmental Impact Dashboard",
@@ -72,9 +74,64 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Timeline interval index
+# Initiatives are sorted by start year and a max-end segment tree is built over
+# them, so "what was active between two years" is answered in O((k + 1) log n)
+# for k matching initiatives.
+CURRENT_YEAR = pd.Timestamp.today().year
+MAX_GANTT_ROWS = 40
+
+def build_interval_index(starts, ends):
+    order = np.argsort(starts, kind='stable')
+    sorted_starts = np.asarray(starts, dtype=float)[order]
+    sorted_ends = np.asarray(ends, dtype=float)[order]
+    size = 1 << max(0, (len(order) - 1).bit_length())
+    tree = np.full(2 * size, -np.inf)
+    tree[size:size + len(order)] = sorted_ends
+    level = size
+    while level > 1:
+        tree[level // 2:level] = np.maximum(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+        level //= 2
+    return {'order': order, 'starts': sorted_starts, 'tree': tree, 'size': size}
+
+def query_interval_index(index, range_start, range_end):
+    # Only the prefix with start <= range_end can overlap; the tree prunes ends < range_start
+    candidates = np.searchsorted(index['starts'], range_end, side='right')
+    tree, size = index['tree'], index['size']
+    hits = []
+    stack = [(1, 0, size)]
+    while stack:
+        node, left, width = stack.pop()
+        if left >= candidates or tree[node] < range_start:
+            continue
+        if width == 1:
+            hits.append(left)
+        else:
+            half = width // 2
+            stack.append((2 * node + 1, left + half, half))
+            stack.append((2 * node, left, half))
+    return np.sort(index['order'][hits])
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def load_timeline(version, current_year):
+    # Built once per snapshot version and shared across sessions, so a rerun only pays for the query
+    df = load_table('timeline', version)
+    # Ongoing initiatives have no end year and are treated as active until today,
+    # or for a single year if they have not started yet
+    end_years = df['End Year'].fillna(np.maximum(df['Start Year'], current_year)).astype(int)
+    df = df.assign(**{'End Year': end_years})
+    return df, build_interval_index(df['Start Year'].to_numpy(), df['End Year'].to_numpy())
+
 # Main title
 st.markdown('<h1 class="main-header">🌫️ Malaysia Haze & Environmental Impact Dashboard</h1>', unsafe_allow_html=True)
 
+# Refuse to render from an empty or incomplete data directory instead of showing stale numbers
+missing = missing_tables()
+if missing:
+    st.error(f"No published snapshot for: {', '.join(missing)} in {DATA_DIR}. "
+             "Set HAZE_DATA_DIR to the published data, or run `python datasets.py --bootstrap` for a new deployment.")
+    st.stop()
+
 # Sidebar navigation
 st.sidebar.title("Navigation")
 sections = [
@@ -125,13 +182,7 @@ elif selected_section == "Haze Conditions Overview":
     st.markdown('<h3 class="subsection-header">API Monitoring Standards</h3>', unsafe_allow_html=True)
     
     # API threshold information (factual standards)
-    api_info = {
-        'API Range': ['0-50', '51-100', '101-200', '201-300', '301+'],
-        'Status': ['Good', 'Moderate', 'Unhealthy', 'Very Unhealthy', 'Hazardous'],
-        'Health Impact': ['Minimal', 'Acceptable', 'Sensitive groups affected', 'Everyone affected', 'Emergency conditions']
-    }
-    
-    df_api_info = pd.DataFrame(api_info)
+    df_api_info = load_table('api_standards')
     st.table(df_api_info)
     
     st.markdown("""
@@ -185,13 +236,7 @@ elif selected_section == "Economic & Social Impacts":
     st.markdown('<h3 class="subsection-header">Documented Health Statistics</h3>', unsafe_allow_html=True)
     
     # Only factual health data
-    health_facts = {
-        'Health Metric': ['Particle Size', 'Lung Penetration', 'Vulnerable Groups'],
-        'Finding': ['94% of particles < 2.5μm diameter', 'Bypass normal body defense', 'Children and elderly most affected'],
-        'Source': ['Ramadhan et al., 2017', 'ScienceDirect Study', 'Multiple Studies']
-    }
-    
-    df_health = pd.DataFrame(health_facts)
+    df_health = load_table('health_facts')
     st.table(df_health)
     
     st.markdown("""
@@ -247,12 +292,7 @@ elif selected_section == "Root Causes Analysis":
     st.markdown('<h3 class="subsection-header">Documented Forest Loss Data</h3>', unsafe_allow_html=True)
     
     # This data is from actual research
-    forest_loss_data = {
-        'State': ['Sarawak', 'Sabah', 'Pahang'],
-        'Forest Loss 2001-2023 (Million Hectares)': [3.27, 1.88, 1.27]
-    }
-    
-    df_forest_actual = pd.DataFrame(forest_loss_data)
+    df_forest_actual = load_table('forest_loss')
     
     fig_forest_actual = px.bar(df_forest_actual, x='State', y='Forest Loss 2001-2023 (Million Hectares)',
                               title='Documented Forest Cover Loss by State (2001-2023)')
@@ -287,26 +327,38 @@ elif selected_section == "Government & NGO Efforts":
     st.markdown('<h2 class="section-header">🏛️ Government & NGO Response Efforts</h2>', unsafe_allow_html=True)
     
     # Timeline of efforts
-    timeline_data = {
-        'Year': [2002, 2014, 2018, 2022, 2024, 2025],
-        'Initiative': [
-            'ASEAN Agreement on Transboundary Haze',
-            'Singapore Transboundary Haze Pollution Act',
-            'Malaysia Bersih Campaign Launch',
-            'Carbon Pricing Introduction',
-            'Budget 2024 Environmental Allocation',
-            'National Energy Transition Fund Increase'
-        ],
-        'Type': ['Regional', 'National', 'National', 'National', 'National', 'National'],
-        'Status': ['Partially Implemented', 'Active', 'Ongoing', 'Planned', 'Implemented', 'Active']
-    }
-    
-    df_timeline = pd.DataFrame(timeline_data)
-    
-    fig_timeline = px.scatter(df_timeline, x='Year', y='Initiative', color='Type', size_max=20,
+    df_timeline, timeline_index = load_timeline(current_version('timeline'), CURRENT_YEAR)
+
+    if df_timeline.empty:
+        st.info("No initiatives have been published to the timeline yet.")
+    else:
+        year_min = int(df_timeline['Start Year'].min())
+        year_max = int(df_timeline['End Year'].max())
+        # A slider needs two distinct bounds; a single-year register has nothing to filter
+        if year_min < year_max:
+            year_range = st.slider("Initiatives active between", year_min, year_max, (year_min, year_max))
+        else:
+            year_range = (year_min, year_max)
+
+        df_active = df_timeline.iloc[query_interval_index(timeline_index, *year_range)]
+        st.caption(f"{len(df_active)} of {len(df_timeline)} initiatives active during {year_range[0]}-{year_range[1]}")
+
+        if len(df_active) <= MAX_GANTT_ROWS:
+            df_gantt = df_active.assign(Lane=df_active['Initiative'], Initiatives=1)
+        else:
+            # Too many rows to read individually: collapse into one lane per type and status
+            df_gantt = (df_active.groupby(['Type', 'Status'], as_index=False)
+                        .agg(**{'Start Year': ('Start Year', 'min'), 'End Year': ('End Year', 'max'),
+                                'Initiatives': ('Initiative', 'size')}))
+            df_gantt['Lane'] = df_gantt['Type'] + ' · ' + df_gantt['Status']
+        df_gantt['Duration'] = df_gantt['End Year'] - df_gantt['Start Year'] + 1
+
+        fig_timeline = px.bar(df_gantt, x='Duration', y='Lane', base='Start Year', color='Type', orientation='h',
+                             hover_data=['Status', 'Start Year', 'End Year', 'Initiatives'],
                              title='Timeline of Major Environmental Initiatives')
-    fig_timeline.update_traces(marker_size=15)
-    st.plotly_chart(fig_timeline, use_container_width=True)
+        fig_timeline.update_layout(xaxis_title='Year', yaxis_title=None, yaxis_autorange='reversed')
+        fig_timeline.update_xaxes(range=[year_range[0], year_range[1] + 1])
+        st.plotly_chart(fig_timeline, use_container_width=True)
     
     st.markdown('<h3 class="subsection-header">Regional Cooperation</h3>', unsafe_allow_html=True)
     
@@ -321,16 +373,10 @@ elif selected_section == "Government & NGO Efforts":
     st.markdown('<h3 class="subsection-header">Government Initiatives</h3>', unsafe_allow_html=True)
     
     # Government funding allocation
-    funding_data = {
-        'Program': ['National Energy Transition Fund', 'Green Technology Financing', 'Biodiversity Conservation', 'Climate Action SDG', 'Environmental Ministry'],
-        'Allocation (RM Million)': [300, 1000, 1000, 20, 7220],
-        'Year': [2025, 2025, 2024, 2025, 2025]
-    }
-    
-    df_funding = pd.DataFrame(funding_data)
+    df_funding = load_table('gov_funding').rename(columns={'2025 (RM Million)': 'Allocation (RM Million)'})
     
     fig_funding = px.bar(df_funding, x='Program', y='Allocation (RM Million)',
-                        title='Government Environmental Funding Allocation 2024-2025')
+                        title='Government Environmental Funding Allocation 2025')
     st.plotly_chart(fig_funding, use_container_width=True)
     
     st.markdown("""
@@ -367,17 +413,7 @@ elif selected_section == "Public Policy Reactions":
     st.markdown('<h3 class="subsection-header">No Plastic Bag Campaign Analysis</h3>', unsafe_allow_html=True)
     
     # Public reaction data for plastic bag campaign
-    reaction_data = {
-        'Response Type': ['Fully Anti-Consumption', 'Partial Anti-Consumption', 'No Change/Resistance'],
-        'Percentage': [67, 33, 0],
-        'Description': [
-            'Complete behavior change, using reusable bags',
-            'Some behavior change, occasional plastic use',
-            'Continued plastic bag usage despite charges'
-        ]
-    }
-    
-    df_reactions = pd.DataFrame(reaction_data)
+    df_reactions = load_table('plastic_bag_reactions')
     
     fig_pie_reactions = px.pie(df_reactions, values='Percentage', names='Response Type',
                               title='Public Response to No Plastic Bag Campaign (Johor State Study)')
@@ -396,12 +432,7 @@ elif selected_section == "Public Policy Reactions":
     """)
     
     # Willingness to participate chart
-    participation_data = {
-        'Willingness Level': ['Highly Willing', 'Moderately Willing', 'Somewhat Willing', 'Unwilling'],
-        'Percentage': [30, 25, 15, 30]
-    }
-    
-    df_participation = pd.DataFrame(participation_data)
+    df_participation = load_table('campaign_participation')
     
     fig_participation = px.bar(df_participation, x='Willingness Level', y='Percentage',
                               title='Public Willingness to Participate in Environmental Campaigns')
@@ -424,13 +455,7 @@ elif selected_section == "Funding & Financial Support":
     st.markdown('<h3 class="subsection-header">Government Funding Allocation</h3>', unsafe_allow_html=True)
     
     # Government funding breakdown
-    gov_funding = {
-        'Category': ['Energy Transition', 'Green Technology', 'Biodiversity Conservation', 'Climate Action', 'Environmental Ministry Operations'],
-        '2024 (RM Million)': [100, 800, 800, 15, 7130],
-        '2025 (RM Million)': [300, 1000, 1000, 20, 7220]
-    }
-    
-    df_gov_funding = pd.DataFrame(gov_funding)
+    df_gov_funding = load_table('gov_funding')
     
     fig_funding_comparison = go.Figure(data=[
         go.Bar(name='2024', x=df_gov_funding['Category'], y=df_gov_funding['2024 (RM Million)']),
@@ -625,12 +650,7 @@ elif selected_section == "Recent Forest Fires & Climate Change":
     st.markdown('<h2 class="section-header">🔥 Recent Forest Fires & Climate Change Connection</h2>', unsafe_allow_html=True)
     
     # Only documented forest loss data (from Greenpeace)
-    documented_forest_loss = {
-        'State': ['Sarawak', 'Sabah', 'Pahang'],
-        'Forest Loss 2001-2023 (Million Hectares)': [3.27, 1.88, 1.27]
-    }
-    
-    df_documented_fires = pd.DataFrame(documented_forest_loss)
+    df_documented_fires = load_table('forest_loss')
     
     fig_documented_loss = px.bar(df_documented_fires, x='State', y='Forest Loss 2001-2023 (Million Hectares)',
                                 title='Documented Forest Cover Loss by State (2001-2023)')